@@ -0,0 +1,14 @@
+# Numba-compiled counting kernels
+#only imported by _kernels.py for large batches, so small runs never pay for importing numba;
+#cache=True keeps the compiled code on disk, so it is compiled once rather than on every run
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def batch_base_counts(buf, offsets):
+    out = np.zeros((len(offsets) - 1, 256), np.int64)
+    for i in prange(len(offsets) - 1):
+        for j in range(offsets[i], offsets[i + 1]):
+            out[i, buf[j]] += 1
+    return out
@@ -0,0 +1,33 @@
+# Batch counting kernels shared by the CLI
+#numba is optional: when it is installed, large batches use the JIT-compiled kernel in _jit.py,
+#which runs over all sequences in parallel; otherwise a plain numpy version is used
+from importlib.util import find_spec
+import numpy as np
+
+HAVE_NUMBA = find_spec("numba") is not None
+JIT_MIN_BASES = 1 << 20 #below this many bases, importing numba and loading the kernel costs more than it saves
+
+
+def _batch_base_counts(buf, offsets):
+    out = np.zeros((len(offsets) - 1, 256), dtype=np.int64)
+    for i in range(len(offsets) - 1):
+        out[i] = np.bincount(buf[offsets[i]:offsets[i + 1]], minlength=256)
+    return out
+
+
+def batch_base_counts(buf, offsets):
+    """
+    Count every byte value for each sequence in a concatenated buffer.
+
+    Args:
+        buf (numpy.ndarray): uint8 array holding all sequences back to back.
+        offsets (numpy.ndarray): int64 array of length nseq + 1; sequence i
+            spans buf[offsets[i]:offsets[i + 1]].
+
+    Returns:
+        numpy.ndarray: (nseq, 256) int64 matrix of byte counts.
+    """
+    if HAVE_NUMBA and len(buf) >= JIT_MIN_BASES:
+        from bio_seq_v1._jit import batch_base_counts as jit_batch_base_counts
+        return jit_batch_base_counts(buf, offsets)
+    return _batch_base_counts(buf, offsets)
@@ -1,73 +1,201 @@
 from tabulate import tabulate
 import argparse
-from bio_seq_v1.fasta import fasta_parser
-from bio_seq_v1.stats import sequence
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import numpy as np
+from bio_seq_v1.fasta import fasta_index, iter_fasta, iter_fasta_batches
+from bio_seq_v1.stats import SequenceBatch, sequence
 
-def print_sequence_lengths_formatted(sequences):
+CHUNK_SIZE = 1000 #records per SequenceBatch while streaming
+BASES = list(sequence.valid) #base-count table columns
+
+def worker_pool(jobs):
+    """
+    Return a context manager providing a process pool, or None when running serially.
+
+    Args:
+        jobs (int): Number of worker processes; 1 or fewer disables the pool.
+    """
+    return ProcessPoolExecutor(jobs) if jobs > 1 else nullcontext()
+
+def batch_map(method, batch, pool=None, jobs=1):
+    """
+    Run a SequenceBatch method over a batch, one contiguous slice per worker when a pool is given.
+
+    Args:
+        method (callable): SequenceBatch method returning one result per sequence.
+        batch (SequenceBatch): Sequences to process.
+        pool (ProcessPoolExecutor or None): Pool from worker_pool().
+        jobs (int): Number of worker processes in the pool.
+
+    Returns:
+        list: Results in batch order.
+    """
+    if pool is None:
+        return list(method(batch))
+    step = -(-len(batch) // jobs)
+    parts = [batch[i:i + step] for i in range(0, len(batch), step)]
+    return [result for part in pool.map(method, parts) for result in part]
+
+def format_gc(gcs):
+    """
+    Format GC percentages as strings like "53.33%" in one vectorised call.
+
+    Args:
+        gcs (sequence of float): GC percentages.
+
+    Returns:
+        list of str: Formatted percentages, in input order.
+    """
+    return np.char.mod("%.2f%%", np.asarray(gcs, dtype=np.float64)).tolist()
+
+def column_widths(filename):
+    """
+    Measure the widest ID, length and GC% cells of a FASTA file in one cheap pre-pass.
+
+    Args:
+        filename (str): Path to the FASTA file.
+
+    Returns:
+        tuple: (id_width, length_width, gc_width) in characters.
+    """
+    id_width = length_width = gc_width = 0
+    for seq_id, length, gc in fasta_index(filename):
+        id_width = max(id_width, len(seq_id))
+        length_width = max(length_width, len(str(length)))
+        if length:
+            gc_width = max(gc_width, len(f"{(gc / length) * 100:.2f}%"))
+    return id_width, length_width, gc_width
+
+def _grid_row(cells, widths, numeric):
+    cells = [str(c).rjust(w) if num else str(c).ljust(w) for c, w, num in zip(cells, widths, numeric)]
+    return "| " + " | ".join(cells) + " |"
+
+def stream_table(rows, headers, widths):
+    """
+    Print a table in tabulate's "grid" layout one row at a time, without buffering it.
+
+    As in tabulate, numbers are right-aligned and text is left-aligned; the
+    alignment of each column is taken from the first row.
+
+    Args:
+        rows (iterable of list): Table rows, consumed once.
+        headers (list of str): Column headers.
+        widths (list of int): Widest cell of each column, headers not included.
+    """
+    rows = iter(rows)
+    first = next(rows, None)
+    numeric = [first is not None and not isinstance(c, str) for c in (first if first is not None else headers)]
+    #like tabulate, headers get two characters of extra room
+    widths = [max(w, len(h) + 2) for w, h in zip(widths, headers)]
+    rule = "+" + "+".join("-" * (w + 2) for w in widths) + "+\n"
+    write = sys.stdout.write
+    write(rule + _grid_row(headers, widths, numeric) + "\n" + rule.replace("-", "="))
+    if first is None:
+        return
+    write(_grid_row(first, widths, numeric) + "\n" + rule)
+    for row in rows:
+        write(_grid_row(row, widths, numeric) + "\n" + rule)
+
+def _print_table(rows, headers, widths=None):
+    #without known column widths the rows have to be buffered so tabulate can size the columns
+    if widths is None:
+        print(tabulate(list(rows), headers=headers, tablefmt="grid"))
+    else:
+        stream_table(rows, headers, widths)
+
+def print_sequence_lengths_formatted(batches, widths=None):
     """
     Print a formatted table of sequence IDs and their lengths.
 
     Args:
-        sequences (list of sequence): List of Sequence objects to process.
+        batches (iterable of SequenceBatch): Sequences to process, consumed once.
+        widths (tuple, optional): Cell widths from column_widths(); when given, rows are printed as they are computed.
     """
-    table = [[s.id, s.sequence_length()] for s in sequences]
-    print(tabulate(table, headers=["Sequence ID", "Length"], tablefmt="grid"))
+    rows = ([i, n] for batch in batches for i, n in zip(batch.ids, batch.sequence_lengths().tolist()))
+    _print_table(rows, ["Sequence ID", "Length"], widths and [widths[0], widths[1]])
 
-def print_gc_content_table(sequences):
+def print_gc_content_table(batches, jobs=1, widths=None):
     """
     Print a formatted table of sequence IDs and their GC content percentages.
 
     Args:
-        sequences (list of sequence): List of Sequence objects to process.
+        batches (iterable of SequenceBatch): Sequences to process, consumed once.
+        jobs (int): Number of worker processes to use.
+        widths (tuple, optional): Cell widths from column_widths(); when given, rows are printed as they are computed.
     """
-    table = [[s.id, f"{s.gc_content():.2f}%"] for s in sequences]
-    print(tabulate(table, headers=["Sequence", "GC%"], tablefmt="grid"))
+    with worker_pool(jobs) as pool:
+        rows = ([i, gc] for batch in batches
+                for i, gc in zip(batch.ids, format_gc(batch_map(SequenceBatch.gc_content, batch, pool, jobs))))
+        _print_table(rows, ["Sequence", "GC%"], widths and [widths[0], widths[2]])
 
-def print_revcomp(sequences):
+def print_revcomp(batches, jobs=1):
     """
-    Print the reverse complement of each sequence in the list.
+    Print the reverse complement of each sequence.
 
     Args:
-        sequences (list of sequence): List of Sequence objects to process.
+        batches (iterable of SequenceBatch): Sequences to process, consumed once.
+        jobs (int): Number of worker processes to use.
     """
-    for s in sequences:
-        print(f">{s.id} reverse complement")
-        print(s.rev_complement())
-        print("-" * 30)
+    with worker_pool(jobs) as pool:
+        for batch in batches:
+            for i, rc in zip(batch.ids, batch_map(SequenceBatch.rev_complement, batch, pool, jobs)):
+                print(f">{i} reverse complement")
+                print(rc)
+                print("-" * 30)
 
-def print_base_count(sequences):
+def print_base_count(batches, jobs=1, widths=None):
     """
     Print a table of the counts of each base for each sequence.
 
     Args:
-        sequences (list of sequence): List of Sequence objects to process.
+        batches (iterable of SequenceBatch): Sequences to process, consumed once.
+        jobs (int): Number of worker processes to use.
+        widths (tuple, optional): Cell widths from column_widths(); when given, rows are printed as they are computed.
+            No count is wider than the longest length, so that width bounds every base column.
     """
-    all_counts = [s.base_count() for s in sequences]
-    bases_present = [b for b in sequence.valid]
-    table = []
-    for counts, s in zip(all_counts, sequences):
-        row = [s.id] + [counts.get(b, 0) for b in bases_present]
-        table.append(row)
-    headers = ["Sequence"] + bases_present
-    print(tabulate(table, headers=headers, tablefmt="grid"))
+    with worker_pool(jobs) as pool:
+        rows = ([i] + [counts[b] for b in BASES] for batch in batches
+                for i, counts in zip(batch.ids, batch_map(SequenceBatch.base_count, batch, pool, jobs)))
+        _print_table(rows, ["Sequence"] + BASES, widths and [widths[0]] + [widths[1]] * len(BASES))
 
-def print_summary(sequences):
+def print_summary(batches, jobs=1):
     """
     Print a full summary of sequences including lengths, GC content, and base composition.
 
+    All three tables come from SequenceBatch.full_stats, a single counting pass
+    per batch; only the per-sequence statistics are held in memory, never the
+    sequences themselves.
+
     Args:
-        sequences (list of sequence): List of Sequence objects to process.
+        batches (iterable of SequenceBatch): Sequences to process, consumed once.
+        jobs (int): Number of worker processes to use.
     """
+    ids, stats = [], []
+    with worker_pool(jobs) as pool:
+        for batch in batches:
+            ids.extend(batch.ids)
+            stats.extend(batch_map(SequenceBatch.full_stats, batch, pool, jobs))
+    #every cell is known at this point, so each column is sized exactly as tabulate would
+    id_width = max(map(len, ids), default=0)
+    lengths = [[i, n] for i, (n, _, _) in zip(ids, stats)]
+    gcs = [[i, gc] for i, gc in zip(ids, format_gc([gc for _, gc, _ in stats]))]
+    counts = [[i] + [c[b] for b in BASES] for i, (_, _, c) in zip(ids, stats)]
+
+    def cell_widths(rows, ncols):
+        return [id_width] + [max((len(str(row[col])) for row in rows), default=0) for col in range(1, ncols)]
+
     print("SEQUENCE LENGTHS")
-    print_sequence_lengths_formatted(sequences)
+    stream_table(lengths, ["Sequence ID", "Length"], cell_widths(lengths, 2))
     print()
 
     print("GC CONTENT")
-    print_gc_content_table(sequences)
+    stream_table(gcs, ["Sequence", "GC%"], cell_widths(gcs, 2))
     print()
 
     print("BASE COMPOSITION")
-    print_base_count(sequences)
+    stream_table(counts, ["Sequence"] + BASES, cell_widths(counts, len(BASES) + 1))
 
 def main():
     """
@@ -83,25 +211,27 @@ def main():
     parser.add_argument("--revcomp", "-rc", help ="Compute reverse complements per sequence", action="store_true")
     parser.add_argument("--basecount", "-b", help ="Compute total count for bases per sequence", action="store_true")
     parser.add_argument("--summary", help="Print summary statistics", action="store_true")
+    parser.add_argument("--jobs", "-j", help="Number of worker processes to spread sequences across", type=int, default=1)
     args = parser.parse_args()
-    sequences = fasta_parser(args.file)
+    #each report streams the file again instead of holding every record in memory
+    if next(iter_fasta(args.file), None) is None:
+        raise ValueError("No sequences found in FASTA file")
+    widths = column_widths(args.file) #cheap pre-pass so the tables can stream
     if not any([args.length, args.gc, args.revcomp, args.basecount, args.summary]):
-        print_summary(sequences)
+        print_summary(iter_fasta_batches(args.file, CHUNK_SIZE), args.jobs)
         exit()
-    if not sequences:
-        raise ValueError("No sequences found in FASTA file")
     if args.length:
-        print_sequence_lengths_formatted(sequences)
+        print_sequence_lengths_formatted(iter_fasta_batches(args.file, CHUNK_SIZE), widths)
         print()
     if args.gc:
-        print_gc_content_table(sequences)
+        print_gc_content_table(iter_fasta_batches(args.file, CHUNK_SIZE), args.jobs, widths)
         print()
     if args.revcomp:
-        print_revcomp(sequences)
+        print_revcomp(iter_fasta_batches(args.file, CHUNK_SIZE), args.jobs)
         print()
     if args.basecount:
-        print_base_count(sequences)
+        print_base_count(iter_fasta_batches(args.file, CHUNK_SIZE), args.jobs, widths)
         print()
     if args.summary:
-        print_summary(sequences)
+        print_summary(iter_fasta_batches(args.file, CHUNK_SIZE), args.jobs)
         exit()
\ No newline at end of file
@@ -1,9 +1,14 @@
 # FASTA file parsing and input validation utilities
-#importing class sequence from stats.py
+#importing class sequence (re-exported, so bio_seq_v1.fasta.sequence is the stats.py class), SequenceBatch, count_gc and the new_sequence factory from stats.py
 #importing Path from pathlib to validate the input path and raise errors
-from bio_seq_v1.stats import sequence
+import mmap
+import sys
+import numpy as np
+from bio_seq_v1.stats import SequenceBatch, count_gc, sequence, new_sequence
 from pathlib import Path
 
+_SPACES = b" \t\v\f" #whitespace other than newlines, only allowed at the ends of sequence lines
+
 #defining the function for validating input path
 def validate_input_path(filename):
     path = Path(filename) #setting the filename's path to a variable
@@ -15,37 +20,95 @@ def validate_input_path(filename):
          raise ValueError(f"File is empty.") #raise Valueerror
     return path 
 
-#defining the fasta parser function with input of the given file
-def fasta_parser(filename):
-    all_seq =[] #creating an empty list to store sequence objects (id + sequence)
-    current_id = None #setting current id to none
-    current_seq = [] #creating an empty list for only sequences
-    valid = set("ACGTUNRYSWKMBDHV-.") #creating a set for valid bases
+#defining a generator over the offsets of the ">" starting each header line of a memory-mapped file
+def _header_offsets(mm):
+    pos = mm.find(b">") #the first header; anything before it is checked by the caller
+    while pos != -1:
+        yield pos
+        pos = mm.find(b"\n>", pos + 1) #bytes.find-style search for the next line starting with ">"
+        if pos != -1:
+            pos += 1 #step past the newline onto the ">"
+
+#defining a generator over (header offset, header end, body end) for every record of a memory-mapped file
+def _record_spans(mm):
+    for pos in _header_offsets(mm):
+        header_end = mm.find(b"\n", pos) #the header runs to the end of its line
+        if header_end == -1:
+            header_end = len(mm)
+        body_end = mm.find(b"\n>", header_end) #the record's bases run up to the next header
+        if body_end == -1:
+            body_end = len(mm)
+        yield pos, header_end, body_end
+
+#defining a generator over (id, length, GC count) for every record, a cheap unvalidated pass
+#used to size table columns before the tables are streamed
+def fasta_index(filename):
+    path = validate_input_path(filename)
+    with path.open('rb') as fasta, mmap.mmap(fasta.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for pos, header_end, body_end in _record_spans(mm):
+            body = mm[header_end:body_end].translate(None, b"\r\n" + _SPACES).upper()
+            yield mm[pos + 1:header_end].rstrip().decode(), len(body), count_gc(body)
+
+#defining a generator that yields validated (id, uppercase sequence bytes) records one at a time
+#the file is memory-mapped, so the OS pages it in on demand and large files never sit in memory
+def _iter_records(filename):
     path = validate_input_path(filename) #a variable for the output of validate_input_path function (described above)
-    
-    with path.open('r') as fasta: #opening the file and reading it
-        for linenum, line in enumerate(fasta, start=1): #running the loop on lines and numerating each line
-            line = line.strip() #removing whitespace if any
-
-            if not line: #if the line is empty (i.e no whitespaces), skip it    
-                continue 
-
-            if line.startswith(">"): #if the line starts with ">", it is probably the header and the indication for starting a new sequence
-                if current_id is not None: #if there is information stored in current_id (i.e name of the sequence on which the loop is running)
-                    all_seq.append(sequence(current_id, "".join(current_seq))) ##append the completed sequence object to the list
-                current_id = line[1:] #then, let current_id store the id (ignoring the ">")
-                current_seq = [] #reset sequence accumulator for the new record 
-            else:
-                if current_id is None: #if current_id is none (i.e loop is at the sequence, yet id is none)
-                     raise ValueError(f"Sequence data found before header on line {linenum}") #raise error
-                seq_line = line.upper() #set the line of sequence to upper case
-                if all(base in valid for base in seq_line): #if all the bases in seq_line also exist in the valid set
-                     current_seq.append(seq_line) #then append it to current_seq
-                else: 
-                     raise ValueError(f"Invalid character in sequence '{current_id}':'{seq_line}' " #otherwise raise error and inform user about the sequence, id, and line
-                                      f"on line: {linenum}")
-
-        if current_id is not None: #at the end of the loop, save the last id, sequence
-                    all_seq.append(sequence(current_id, "".join(current_seq))) 
-
-    return all_seq  #return the list of sequence objects
\ No newline at end of file
+
+    with path.open('rb') as fasta, mmap.mmap(fasta.fileno(), 0, access=mmap.ACCESS_READ) as mm: #opening the file and mapping it
+        first = mm.find(b">")
+        lead = mm[:len(mm) if first == -1 else first] #everything before the first header, which may only be blank lines
+        if lead.strip(): #if there is sequence data before the first header, raise error with its line number
+             linenum = lead.count(b"\n", 0, len(lead) - len(lead.lstrip())) + 1
+             raise ValueError(f"Sequence data found before header on line {linenum}")
+
+        for pos, header_end, body_end in _record_spans(mm):
+            current_id = sys.intern(mm[pos + 1:header_end].rstrip().decode()) #the id (ignoring the ">"), interned so repeated ids share one string
+            raw = mm[header_end:body_end]
+            body = raw.translate(None, b"\r\n") #joining the lines by dropping the newlines
+            if body.translate(None, _SPACES) != body: #rare: other whitespace, which is only allowed at the ends of lines
+                 body = b"".join(line.strip() for line in raw.split(b"\n"))
+            if body.translate(None, sequence._valid_bytes): #if anything but valid bases is left, find the line to report
+                 _raise_invalid_line(mm, current_id, header_end, body_end)
+            yield current_id, body.upper() #hand the completed record to the caller
+
+#defining the slow path that reports the first line of a record holding an invalid character
+def _raise_invalid_line(mm, current_id, start, end):
+    linenum = mm[:start].count(b"\n") + 1 #line number of the header
+    for line in mm[start:end].split(b"\n"):
+        seq_line = line.strip().upper()
+        if seq_line.translate(None, sequence._valid_bytes):
+             raise ValueError(f"Invalid character in sequence '{current_id}':'{seq_line.decode(errors='replace')}' "
+                              f"on line: {linenum}")
+        linenum += 1
+
+#defining a generator that yields sequence objects one record at a time
+#with packed=True, pure-ACGT records are stored 2 bits per base (see sequence2bit in stats.py)
+def iter_fasta(filename, packed=False):
+    for seq_id, seq in _iter_records(filename):
+        yield new_sequence(seq_id, seq, packed)
+
+#defining a generator that groups records into SequenceBatch objects of up to `size` sequences,
+#writing the bases straight into one buffer per batch instead of creating a sequence object per record
+def iter_fasta_batches(filename, size=1000):
+    ids, parts, lengths = [], [], [0] #lengths starts with 0 so its cumulative sum gives the offsets
+    for seq_id, seq in _iter_records(filename):
+        if not seq: #same rule as the sequence constructor
+            raise ValueError(f"Sequence for ID '{seq_id}' is empty")
+        ids.append(seq_id)
+        parts.append(seq) #_iter_records already validated and uppercased the bases
+        lengths.append(len(seq))
+        if len(ids) == size: #batch is full, hand it over and start a new one
+            yield SequenceBatch(ids, b"".join(parts), np.cumsum(lengths, dtype=np.int64))
+            ids, parts, lengths = [], [], [0]
+    if ids: #the last, partially filled batch
+        yield SequenceBatch(ids, b"".join(parts), np.cumsum(lengths, dtype=np.int64))
+
+#defining the fasta parser function with input of the given file
+def fasta_parser(filename, packed=False):
+    all_seq = [] #creating an empty list to store sequence objects (id + sequence)
+    payloads = {} #every sequence is kept anyway, so identical sequences can share one bytes object
+    for record in iter_fasta(filename, packed):
+        if type(record) is sequence: #packed records keep their own array
+            record.sequence = payloads.setdefault(record.sequence, record.sequence)
+        all_seq.append(record)
+    return all_seq #return the list of sequence objects
\ No newline at end of file
@@ -1,4 +1,34 @@
+import re
 import warnings
+from dataclasses import dataclass
+import numpy as np
+from bio_seq_v1._kernels import batch_base_counts
+
+#hyperscan is optional: when installed, sequences are validated with a SIMD regex scan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+def _gc_mask(buf):
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    return (arr == ord("G")) | (arr == ord("C"))
+
+def count_gc(buf):
+    """
+    Count the G and C bases in an uppercase byte buffer.
+
+    Two whole-array byte comparisons and a population count let numpy compare
+    a full SIMD register of bases per instruction, with no per-base branching.
+
+    Args:
+        buf (bytes): Uppercase sequence bytes.
+
+    Returns:
+        int: Number of G and C bases.
+    """
+    return int(np.count_nonzero(_gc_mask(buf)))
+
 
 class sequence():
     """
@@ -7,7 +37,7 @@ class sequence():
 
     Attributes:
         id (str): Identifier for the sequence.
-        sequence (str): Uppercase string of sequence bases.
+        sequence (bytes): Uppercase ASCII bytes of sequence bases.
     """
 
     revcomp_dict = { 
@@ -15,8 +45,13 @@ class sequence():
     "R":"Y", "Y":"R", "S":"S", "W":"W",
     "K":"M", "M":"K", "B":"V", "D":"H",
     "H":"D", "V":"B", "N":"N"}
-    
+    _revcomp_table = bytes.maketrans("".join(revcomp_dict).encode("ascii"),
+                                     "".join(revcomp_dict.values()).encode("ascii"))
+
     valid = "ACGTUNRYSWKMBDHV-." 
+    _valid_bytes = (valid + valid.lower()).encode("ascii") #deletion table for bytes.translate validation
+    _sniff_length = 4096 #prefix used to guess which letters a sequence uses
+    _counters = {} #alphabet -> generated counting function, see _make_counter
 
     def __init__(self, id, sequence):
         """
@@ -24,18 +59,28 @@ class sequence():
 
         Args:
             id (str): Identifier for the sequence.
-            sequence (str): Sequence string containing valid bases.
+            sequence (str or bytes): Sequence string containing valid bases.
 
         Raises:
             ValueError: If the sequence is empty or contains invalid characters.
         """
         if not sequence: 
              raise ValueError(f"Sequence for ID '{id}' is empty")
-        invalid_chars = set(sequence.upper())-set(self.valid) 
-        if invalid_chars: 
-             raise ValueError(f"Sequence '{id}' contains invalid characters: {invalid_chars}")
+        if isinstance(sequence, str):
+            try:
+                sequence = sequence.encode("ascii")
+            except UnicodeEncodeError:
+                raise ValueError(f"Sequence '{id}' contains invalid characters: "
+                                 f"{set(c for c in sequence if not c.isascii())}") from None
+        sequence = bytes(sequence)
+        #the hyperscan pass only answers yes/no; translate then finds the offending characters
+        if _invalid_scanner is None or _has_invalid_bytes(sequence):
+            invalid_chars = sequence.translate(None, delete=self._valid_bytes)
+            if invalid_chars: 
+                 raise ValueError(f"Sequence '{id}' contains invalid characters: {set(invalid_chars.decode('ascii', errors='replace'))}")
         self.id = id 
         self.sequence = sequence.upper()
+        self._stats = None #base counts, filled in on the first base_count() call
              
     def sequence_length(self): 
         """
@@ -48,7 +93,7 @@ class sequence():
         return len(self.sequence) 
     
     def base_count(self):
-            """
+        """
         Count the occurrences of each valid base in the sequence.
 
         Returns:
@@ -56,15 +101,46 @@ class sequence():
 
         Notes:
             If an invalid character is present, a warning is issued.
+            The counts are computed once and cached on the object.
         """
-            counts = {b:0 for b in self.valid} 
-            for b in self.sequence: 
-                if b in counts:
-                    counts[b] += 1
-                else:
-                     warnings.warn(f"Invalid character in id: '{self.id}' and sequence: '{self.sequence}")
-            return counts 
-    
+        if self._stats is not None:
+            return dict(self._stats)
+        arr = np.frombuffer(self.sequence, dtype=np.uint8)
+        #most sequences use only a few letters: count just the ones seen in a prefix, and
+        #fall back to the full bincount if they do not cover the whole sequence
+        observed = self._make_counter(bytes(sorted(set(self.sequence[:self._sniff_length]))))(arr)
+        if sum(observed.values()) == len(arr):
+            counts = {b: 0 for b in self.valid}
+            counts.update(observed)
+        else:
+            counts_full = np.bincount(arr, minlength=256)
+            counts = {b: int(counts_full[ord(b)]) for b in self.valid}
+            if counts_full.sum() != sum(counts.values()):
+                warnings.warn(f"Invalid character in id: '{self.id}' and sequence: '{self.sequence}")
+        self._stats = counts
+        return dict(counts)
+
+    @classmethod
+    def _make_counter(cls, alphabet):
+        """
+        Return a counting function specialised to `alphabet`, generating it on first use.
+
+        The generated function is straight-line code with one vectorised
+        comparison per letter, e.g. for b"ACGT":
+        ``lambda arr: {'A': int(count(arr == 65)), 'C': ..., 'G': ..., 'T': ...}``.
+
+        Args:
+            alphabet (bytes): Uppercase letters to count.
+
+        Returns:
+            callable: Function mapping a uint8 array to a dict of counts.
+        """
+        counter = cls._counters.get(alphabet)
+        if counter is None:
+            src = "lambda arr: {" + ", ".join(f"{chr(b)!r}: int(count(arr == {b}))" for b in alphabet) + "}"
+            counter = cls._counters[alphabet] = eval(src, {"count": np.count_nonzero})
+        return counter
+
     def gc_content(self):
         """
         Calculate the GC content percentage of the sequence.
@@ -77,24 +153,267 @@ class sequence():
         """
         if not self.sequence: 
              return 0.0 
-        g = self.sequence.count("G") 
-        c = self.sequence.count("C") 
-        total = self.sequence_length() 
-        return ((g+c)/total)*100 
+        if self._stats is not None:
+            gc = self._stats["G"] + self._stats["C"]
+        else:
+            gc = count_gc(self.sequence)
+        total = len(self.sequence) #__init__ rejects invalid characters, so every position counts
+        return (gc/total)*100 
     
+    def full_stats(self):
+        """
+        Compute the length, GC content and base counts together from one counting pass.
+
+        Returns:
+            tuple: (length (int), GC percentage (float), base counts (dict)).
+        """
+        counts = self.base_count()
+        length = self.sequence_length()
+        return length, ((counts["G"] + counts["C"]) / length) * 100, counts
+
     def rev_complement(self):
-            """
+        """
         Compute the reverse complement of the sequence.
 
         Returns:
             str: Reverse complement string.
 
+        Notes:
+            Gap characters ('-' and '.') are kept as they are.
+        """
+        return self.sequence.translate(self._revcomp_table)[::-1].decode("ascii")
+
+
+def _compile_invalid_scanner(alphabet):
+    if hyperscan is None:
+        return None
+    db = hyperscan.Database()
+    db.compile(expressions=[f"[^{re.escape(alphabet)}]".encode("ascii")], ids=[0],
+               flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_CASELESS])
+    return db
+
+_invalid_scanner = _compile_invalid_scanner(sequence.valid) #None without hyperscan
+
+def _has_invalid_bytes(buf):
+    found = []
+    _invalid_scanner.scan(buf, match_event_handler=lambda *match: found.append(match))
+    return bool(found)
+
+
+class sequence2bit(sequence):
+    """
+    A pure-ACGT sequence packed at 2 bits per base (A=0, C=1, G=2, T=3),
+    four bases per byte with the first base in the high bits.
+
+    Attributes:
+        id (str): Identifier for the sequence.
+        packed (numpy.ndarray): uint8 array of packed bases.
+    """
+
+    _bases = np.frombuffer(b"ACGT", dtype=np.uint8)
+    _codes = np.full(256, 255, dtype=np.uint8) #byte -> 2-bit code, 255 for anything outside ACGT
+    for _code, _base in enumerate("ACGT"):
+        _codes[ord(_base)] = _codes[ord(_base.lower())] = _code
+    del _code, _base
+    _popcount = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+    #packed byte -> its four bases as ASCII, and packed byte -> the byte holding its reverse complement
+    #(_quads is viewed as uint32 so each lookup gathers all four bytes at once)
+    _quads = np.array([[b"ACGT"[(i >> shift) & 3] for shift in (6, 4, 2, 0)] for i in range(256)],
+                      dtype=np.uint8).view(np.uint32).ravel()
+    _rc_bytes = np.array([sum((3 - ((i >> (2 * lane)) & 3)) << (6 - 2 * lane) for lane in range(4))
+                          for i in range(256)], dtype=np.uint8)
+
+    def __init__(self, id, sequence):
+        """
+        Initialize a packed Sequence object.
+
+        Args:
+            id (str): Identifier for the sequence.
+            sequence (str or bytes): Sequence made only of A, C, G and T (any case).
+
         Raises:
-            ValueError: If the sequence contains invalid bases not in revcomp_dict.
+            ValueError: If the sequence is empty or contains anything but A, C, G and T.
+        """
+        if not sequence:
+             raise ValueError(f"Sequence for ID '{id}' is empty")
+        if isinstance(sequence, str):
+            sequence = sequence.encode("ascii", errors="replace")
+        codes = self._codes[np.frombuffer(bytes(sequence), dtype=np.uint8)]
+        if (codes > 3).any():
+             raise ValueError(f"Sequence '{id}' contains bases other than A, C, G and T")
+        self.id = id
+        self._length = len(codes)
+        codes = np.concatenate([codes, np.zeros(-len(codes) % 4, dtype=np.uint8)]).reshape(-1, 4) #pad with A (code 0)
+        self.packed = (codes[:, 0] << 6) | (codes[:, 1] << 4) | (codes[:, 2] << 2) | codes[:, 3]
+        self._stats = None
+
+    def _unpack(self):
+        codes = np.empty((len(self.packed), 4), dtype=np.uint8)
+        for lane in range(4):
+            codes[:, lane] = (self.packed >> (6 - 2 * lane)) & 3
+        return codes.ravel()[:self._length]
+
+    @property
+    def sequence(self):
+        """bytes: The unpacked uppercase sequence."""
+        return np.take(self._quads, self.packed).tobytes()[:self._length]
+
+    def sequence_length(self):
+        return self._length
+
+    def base_count(self):
+        if self._stats is None:
+            counts = np.bincount(self._unpack(), minlength=4)
+            self._stats = {b: 0 for b in self.valid}
+            self._stats.update(zip("ACGT", counts.tolist()))
+        return dict(self._stats)
+
+    def gc_content(self):
+        #C (01) and G (10) are the only codes whose two bits differ; padding is A (00)
+        gc = int(self._popcount[(self.packed ^ (self.packed >> 1)) & 0x55].sum())
+        return (gc / self._length) * 100
+
+    def rev_complement(self):
+        #one table lookup per packed byte complements and reverses its four bases; reversing the
+        #byte order finishes the job, leaving the padding at the front
+        pad = 4 * len(self.packed) - self._length
+        return np.take(self._quads, np.take(self._rc_bytes, self.packed[::-1])).tobytes()[pad:].decode("ascii")
+
+
+def new_sequence(id, sequence_data, packed=False):
+    """
+    Build a sequence object, choosing the 2-bit packed form when asked and possible.
+
+    Args:
+        id (str): Identifier for the sequence.
+        sequence_data (str or bytes): Sequence string containing valid bases.
+        packed (bool): Store pure-ACGT sequences as sequence2bit.
+
+    Returns:
+        sequence: A sequence2bit for pure-ACGT input when packed is True, otherwise a sequence.
+    """
+    if packed and sequence_data:
+        raw = sequence_data.encode("ascii", errors="replace") if isinstance(sequence_data, str) else bytes(sequence_data)
+        if not raw.translate(None, delete=b"ACGTacgt"):
+            return sequence2bit(id, raw)
+    return sequence(id, sequence_data)
+
+
+@dataclass(eq=False) #field-wise == is ambiguous for the offsets array
+class SequenceBatch:
+    """
+    A structure-of-arrays collection of sequences: the bases of every sequence
+    live back to back in one buffer and each sequence is a slice of it.
+
+    Attributes:
+        ids (list of str): Identifiers, one per sequence.
+        buf (bytes): Uppercase bases of all sequences, concatenated.
+        offsets (numpy.ndarray): int64 array of length len(ids) + 1;
+            sequence i is buf[offsets[i]:offsets[i + 1]].
+    """
+
+    ids: list
+    buf: bytes
+    offsets: np.ndarray
+
+    @classmethod
+    def from_sequences(cls, sequences):
+        """
+        Build a batch from sequence objects.
+
+        Args:
+            sequences (iterable of sequence): Sequence objects to collect.
+
+        Returns:
+            SequenceBatch: The sequences in input order.
+        """
+        sequences = list(sequences)
+        offsets = np.zeros(len(sequences) + 1, dtype=np.int64)
+        np.cumsum([s.sequence_length() for s in sequences], out=offsets[1:])
+        return cls([s.id for s in sequences], b"".join(s.sequence for s in sequences), offsets)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        """
+        Return one sequence object for an int index, or a sub-batch for a slice.
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("SequenceBatch slices must be contiguous")
+            offsets = self.offsets[start:max(start, stop) + 1]
+            return SequenceBatch(self.ids[start:stop], self.buf[offsets[0]:offsets[-1]], offsets - offsets[0])
+        index = range(len(self))[index] #normalises negative indices and raises IndexError
+        return sequence(self.ids[index], self.buf[self.offsets[index]:self.offsets[index + 1]])
+
+    def sequence_lengths(self):
+        """
+        Return the length of every sequence.
+
+        Returns:
+            numpy.ndarray: int64 array of lengths.
+        """
+        return np.diff(self.offsets)
+
+    def byte_counts(self):
         """
+        Count every byte value in every sequence with one batch kernel call.
 
-            reverse = self.sequence[::-1] 
-            complement = "".join(self.revcomp_dict[b] for b in reverse if b in self.valid )
-            return complement
+        Returns:
+            numpy.ndarray: (len(self), 256) int64 matrix of counts.
+        """
+        return batch_base_counts(np.frombuffer(self.buf, dtype=np.uint8), self.offsets)
 
+    def base_count(self):
+        """
+        Count the occurrences of each valid base in every sequence.
+
+        Returns:
+            list of dict: Base counts for each sequence, in batch order.
+        """
+        return self._count_dicts(self.byte_counts())
+
+    @staticmethod
+    def _count_dicts(byte_counts):
+        counts = byte_counts[:, [ord(b) for b in sequence.valid]]
+        return [dict(zip(sequence.valid, row)) for row in counts.tolist()]
+
+    def gc_content(self):
+        """
+        Calculate the GC content percentage of every sequence.
 
+        Returns:
+            numpy.ndarray: float64 array of GC percentages.
+        """
+        if not len(self):
+            return np.zeros(0)
+        gc = np.add.reduceat(_gc_mask(self.buf), self.offsets[:-1], dtype=np.int64)
+        return gc / self.sequence_lengths() * 100
+
+    def full_stats(self):
+        """
+        Compute the length, GC content and base counts of every sequence from one kernel pass.
+
+        Returns:
+            list of tuple: (length (int), GC percentage (float), base counts (dict)) per sequence.
+        """
+        byte_counts = self.byte_counts()
+        lengths = self.sequence_lengths()
+        gcs = (byte_counts[:, ord("G")] + byte_counts[:, ord("C")]) / lengths * 100 #same order as sequence.gc_content, so the floats match
+        return list(zip(lengths.tolist(), gcs.tolist(), self._count_dicts(byte_counts)))
+
+    def rev_complement(self):
+        """
+        Compute the reverse complement of every sequence.
+
+        The whole buffer is complemented and reversed once; sequence i then
+        sits at the mirrored position of its slice.
+
+        Returns:
+            list of str: Reverse complement strings, in batch order.
+        """
+        rc = self.buf.translate(sequence._revcomp_table)[::-1].decode("ascii")
+        end = len(self.buf)
+        return [rc[end - stop:end - start] for start, stop in zip(self.offsets[:-1].tolist(), self.offsets[1:].tolist())]
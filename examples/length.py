@@ -1,3 +1,3 @@
 from bio_seq_v1.stats import sequence
 seq = sequence("id","ATCCGTATHMB")
-print(seq.sequence_lengths())
+print(seq.sequence_length())
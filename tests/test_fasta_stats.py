@@ -1,6 +1,9 @@
 import pytest
-from bio_seq_v1.stats import sequence
-from bio_seq_v1.fasta import fasta_parser
+import numpy as np
+from bio_seq_v1.stats import SequenceBatch, sequence, sequence2bit
+from bio_seq_v1.fasta import fasta_parser, iter_fasta, iter_fasta_batches
+from bio_seq_v1.cli import batch_map, format_gc, stream_table, worker_pool
+from tabulate import tabulate
 fasta_seq = "tests/data/tiny.fasta"
 single_seq = "tests/data/single.fasta"
 
@@ -10,12 +13,12 @@ def test_fasta_parser():
     assert isinstance(parsed, list)
     assert all(isinstance(s, sequence) for s in parsed)
     first_seq = parsed[0]
-    assert first_seq.sequence == "ATGCGTACGTAGCTAGTTAGCGATCGGGGCTAGCTAGCTAGCTAG"
+    assert first_seq.sequence == b"ATGCGTACGTAGCTAGTTAGCGATCGGGGCTAGCTAGCTAGCTAG"
     assert first_seq.id == "seq1"
 #test length of sequence
 def test_seq_length():
     parsed = fasta_parser(fasta_seq)
-    assert parsed[0].sequence_lengths() == 45
+    assert parsed[0].sequence_length() == 45
 #test gc content     
 def test_gc_content():
     parsed = fasta_parser(fasta_seq)
@@ -61,4 +64,106 @@ def test_ambig_codes():
 
 def test_empty_sequence():
     seq = sequence("id", "")
-    assert seq.gc_content() == 0.0
\ No newline at end of file
+    assert seq.gc_content() == 0.0
+
+def test_reverse_complement_gaps():
+    seq = sequence("id", "AC-G.T")
+    assert seq.rev_complement() == "A.C-GT"
+
+def test_invalid_characters():
+    with pytest.raises(ValueError, match="invalid characters"):
+        sequence("id", "acgz")
+
+def test_sequence_batch_matches_sequences():
+    parsed = fasta_parser(fasta_seq)
+    batch = next(iter_fasta_batches(fasta_seq))
+    assert batch.ids == [s.id for s in parsed]
+    assert batch.buf == SequenceBatch.from_sequences(parsed).buf
+    assert batch.sequence_lengths().tolist() == [s.sequence_length() for s in parsed]
+    assert batch.base_count() == [s.base_count() for s in parsed]
+    assert batch.gc_content().tolist() == [s.gc_content() for s in parsed]
+    assert batch.rev_complement() == [s.rev_complement() for s in parsed]
+    assert batch.full_stats() == [s.full_stats() for s in parsed]
+    assert batch[1:].rev_complement() == [s.rev_complement() for s in parsed[1:]]
+    assert batch[-1].sequence == parsed[-1].sequence
+
+def test_iter_fasta_streams_records():
+    records = iter_fasta(fasta_seq)
+    assert next(records).id == "seq1"
+    assert [s.id for s in records] == ["seq2", "seq3"]
+
+def test_packed_sequences_match_unpacked():
+    plain = fasta_parser(fasta_seq)
+    packed = fasta_parser(fasta_seq, packed=True)
+    assert all(isinstance(s, sequence2bit) for s in packed)
+    for p, s in zip(packed, plain):
+        assert p.sequence == s.sequence
+        assert p.base_count() == s.base_count()
+        assert p.gc_content() == s.gc_content()
+        assert p.rev_complement() == s.rev_complement()
+
+def test_stream_table_matches_tabulate(capsys):
+    tables = [
+        (["Sequence ID", "Length"], [["seq1", 45], ["seq2", 27]]),
+        (["Sequence", "GC%"], [["seq1", "53.33%"], ["seq2", "100.00%"], ["s3", "0.00%"]]),
+        (["Sequence"] + list(sequence.valid),
+         [[s.id] + list(s.base_count().values()) for s in fasta_parser(fasta_seq)]),
+    ]
+    for headers, rows in tables:
+        widths = [max(len(str(row[col])) for row in rows) for col in range(len(headers))]
+        stream_table(iter(rows), headers, widths)
+        assert capsys.readouterr().out.rstrip() == tabulate(rows, headers=headers, tablefmt="grid")
+
+def test_fasta_reexports_sequence():
+    from bio_seq_v1 import fasta
+    assert fasta.sequence is sequence
+
+def test_duplicate_sequences_share_storage(tmp_path):
+    fasta = tmp_path / "dups.fasta"
+    fasta.write_text(">a\nACGT\n>b\nacgt\n>c\nACGA\n")
+    parsed = fasta_parser(fasta)
+    assert parsed[0].sequence is parsed[1].sequence
+    assert parsed[0].sequence is not parsed[2].sequence
+
+def test_base_count_letter_outside_sniffed_prefix():
+    seq = sequence("id", "A" * 5000 + "N")
+    counts = seq.base_count()
+    assert counts["A"] == 5000
+    assert counts["N"] == 1
+
+def test_fasta_parser_line_endings_and_errors(tmp_path):
+    fasta = tmp_path / "crlf.fasta"
+    fasta.write_bytes(b"\n>a desc\r\nACGT\r\nacg \r\n\n>b\nNNNN")
+    parsed = fasta_parser(fasta)
+    assert [(s.id, s.sequence) for s in parsed] == [("a desc", b"ACGTACG"), ("b", b"NNNN")]
+    bad = tmp_path / "bad.fasta"
+    bad.write_text(">a\nACGT\nAC GT\n")
+    with pytest.raises(ValueError, match="on line: 3"):
+        fasta_parser(bad)
+    headless = tmp_path / "headless.fasta"
+    headless.write_text("\nACGT\n>a\nAC\n")
+    with pytest.raises(ValueError, match="before header on line 2"):
+        fasta_parser(headless)
+
+def test_batch_gc_matches_sequence_rounding():
+    seq = sequence("id", "G" * 1116 + "A" * 804)
+    batch = SequenceBatch.from_sequences([seq])
+    assert batch.gc_content().tolist() == [seq.gc_content()]
+    assert batch.full_stats()[0][1] == seq.gc_content()
+    assert f"{seq.gc_content():.2f}%" == "58.13%"
+
+def test_jit_kernel_matches_numpy(monkeypatch):
+    pytest.importorskip("numba")
+    from bio_seq_v1 import _kernels
+    monkeypatch.setattr(_kernels, "JIT_MIN_BASES", 0)
+    batch = next(iter_fasta_batches(fasta_seq))
+    buf = np.frombuffer(batch.buf, dtype=np.uint8)
+    assert (_kernels.batch_base_counts(buf, batch.offsets) == _kernels._batch_base_counts(buf, batch.offsets)).all()
+
+def test_batch_map_pool_matches_serial():
+    batch = SequenceBatch.from_sequences(
+        [sequence(f"s{i}", "ACGTN"[i % 5] * (i + 1) + "GC") for i in range(7)])
+    for method in (SequenceBatch.gc_content, SequenceBatch.base_count, SequenceBatch.rev_complement):
+        serial = batch_map(method, batch)
+        with worker_pool(2) as pool:
+            assert batch_map(method, batch, pool, 2) == serial